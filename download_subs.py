@@ -10,6 +10,12 @@ import library.OpenSubtitles as OpenSubtitles
 from library.SubDL import SubDL
 import requests
 
+# Use the libyaml backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 console = Console()
 
 
@@ -30,7 +36,7 @@ class SubtitleDownloader:
     def _read_config_file(self, file_path: str) -> Dict:
         try:
             with open(file_path, "r") as file:
-                return yaml.safe_load(file)
+                return yaml.load(file, Loader=YamlLoader)
         except FileNotFoundError:
             console.print(f"[bold red]Error: Config file not found at {file_path}[/]")
             sys.exit(1)
@@ -50,6 +56,7 @@ class SubtitleDownloader:
                         "sync_audio_to_subs", False
                     ),
                     auto_select=self.config["general"].get("auto_selection", False),
+                    verbose=self.config["general"].get("verbose", False),
                 )
             except KeyError as e:
                 console.print(
@@ -67,6 +74,7 @@ class SubtitleDownloader:
                     ),
                     hearing_impaired=False,
                     auto_select=self.config["general"].get("auto_selection", False),
+                    verbose=self.config["general"].get("verbose", False),
                 )
             except KeyError as e:
                 console.print(f"[bold red]Error: Missing key in subdl config: {e}[/]")
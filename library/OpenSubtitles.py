@@ -1,16 +1,24 @@
 # OpenSubtitles.py is a class that handles subtitle search and download from opensubtitles API.
 import requests
+from urllib3.util.retry import Retry
+import functools
 import json
+import shutil
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
-from library.subtitle_utils import SubtitleUtils
-import re
+from library.subtitle_utils import SERIES_NAME_REGEX, SubtitleUtils
 
 
 class OpenSubtitles:
+    # Number of results (with at least one hash match) from the initial search
+    # above which the series/alternate name fallback searches are skipped
+    early_exit_threshold = 10
+    # Number of media files processed concurrently in automatic mode
+    max_workers = 4
 
     def __init__(
         self,
@@ -21,6 +29,7 @@ class OpenSubtitles:
         sync_audio_to_subs=False,
         hearing_impaired=False,
         auto_select=True,
+        verbose=False,
     ):
         self.username = username
         self.password = password
@@ -29,10 +38,29 @@ class OpenSubtitles:
         self.sync_audio_to_subs = sync_audio_to_subs
         self.hearing_impaired = hearing_impaired
         self.auto_select = auto_select
-        self.console = Console()
+        self.verbose = verbose
+        # Reuse connections (and their TLS handshakes) across API calls
+        self.session = requests.Session()
+        # Several files search concurrently, retry and back off when the API
+        # rate limits or fails transiently instead of reporting no subtitles
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self.session.mount("https://", adapter)
         self.subtitle_utils = SubtitleUtils()
         self.token = self.login()
 
+    @functools.cached_property
+    def console(self):
+        """Rich console, only created once something is printed"""
+        return Console()
+
     def login(self):
         token = self.subtitle_utils.read_token()
         if token:
@@ -48,7 +76,7 @@ class OpenSubtitles:
             "Api-Key": self.api_key,
         }
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+            response = self.session.post(url, headers=headers, json=payload, timeout=10)
             response.raise_for_status()
             token = response.json()["token"]
             self.subtitle_utils.save_token(token)
@@ -95,7 +123,7 @@ class OpenSubtitles:
             params["query"] = media_name
 
         try:
-            response = requests.get(url, headers=headers, params=params, timeout=10)
+            response = self.session.get(url, headers=headers, params=params, timeout=10)
             response.raise_for_status()
             results = response.json()["data"]
             return results
@@ -125,7 +153,7 @@ class OpenSubtitles:
             payload["file_id"] = int(
                 selected_subtitles["attributes"]["files"][0]["file_id"]
             )
-            response = requests.post(
+            response = self.session.post(
                 url, headers=headers, data=json.dumps(payload), timeout=10
             )
             response.raise_for_status()
@@ -149,11 +177,12 @@ class OpenSubtitles:
     def save_subtitle(self, url, path):
         """Download and save subtitle file from url to path"""
         try:
-            response = requests.get(url, stream=True, timeout=10)
+            response = self.session.get(url, stream=True, timeout=10)
             response.raise_for_status()
+            # Copy straight from the raw stream in 64 KiB blocks
+            response.raw.decode_content = True
             with open(path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                shutil.copyfileobj(response.raw, f, length=65536)
             return True
         except requests.exceptions.RequestException as e:
             self.console.print(f"[bold red]Error downloading subtitle: {e}[/]")
@@ -162,10 +191,12 @@ class OpenSubtitles:
             self.console.print(f"[bold red]Unexpected error saving subtitle: {e}[/]")
             return False
 
-    def process_media_file(self, media_path, language_choice, media_name=""):
+    def process_media_file(
+        self, media_path, language_choice, media_name="", media_hash=None
+    ):
         try:
             path = Path(media_path)
-            hash = self.subtitle_utils.hashFile(media_path)
+            hash = media_hash or self.subtitle_utils.hashFile(media_path)
             if not media_name:
                 media_name = path.stem
             rprint(
@@ -178,41 +209,55 @@ class OpenSubtitles:
             if not results:
                 rprint(f"[red]No subtitles found for {media_name}[/red]")
             else:
-                rprint(f"[green]Found {len(results)} results[/green]")
+                rprint(
+                    f"[yellow]{media_name}[/yellow]: [green]Found {len(results)} results[/green]"
+                )
 
-            # parse series name and search for subtitles by series name alone series name exapmle: "The Flash 2014", "Dune - Prophecy (2024) - S01E01 - - The Hidden Hand [AMZN WEBDL-1080p][8bit][h264][EAC3 5.1]-playWEB"
-            series_name = re.search(
-                r"(.+?)(?:\s-\sS\d{2}E\d{2}|\s-\s\d{4})", media_name
+            # Skip the fallback searches when the first search already returned
+            # enough results including a hash match
+            has_enough_results = (
+                results
+                and len(results) >= self.early_exit_threshold
+                and any(r["attributes"].get("moviehash_match") for r in results)
             )
-
-            if series_name:
-                series_name = series_name.group(1)
+            if has_enough_results:
                 rprint(
-                    f"[cyan]Searching for subtitles for series[/cyan] [yellow]{series_name}[/yellow]"
-                )
-                temp_results = self.search(
-                    media_hash=hash, media_name=series_name, languages=language_choice
+                    f"[yellow]{media_name}[/yellow]: [blue]Found enough hash matched results, skipping fallback searches[/blue]"
                 )
-                if temp_results:
-                    results.extend(temp_results)
+            else:
+                # parse series name and search for subtitles by series name alone series name exapmle: "The Flash 2014", "Dune - Prophecy (2024) - S01E01 - - The Hidden Hand [AMZN WEBDL-1080p][8bit][h264][EAC3 5.1]-playWEB"
+                series_name = SERIES_NAME_REGEX.search(media_name)
+
+                if series_name:
+                    series_name = series_name.group(1)
                     rprint(
-                        f"[blue]Adding more results by searching for[/blue] [yellow]{series_name}[/yellow], [green]found {len(temp_results)} results[/green]"
+                        f"[cyan]Searching for subtitles for series[/cyan] [yellow]{series_name}[/yellow]"
                     )
-
-            # Add more results using alternate names
-            new_search_terms = self.subtitle_utils.get_alternate_names(media_name)
-            if new_search_terms:
-                for term in new_search_terms:
                     temp_results = self.search(
                         media_hash=hash,
-                        media_name=term,
+                        media_name=series_name,
                         languages=language_choice,
                     )
                     if temp_results:
                         results.extend(temp_results)
                         rprint(
-                            f"[blue]Adding more results by searching for[/blue] [yellow]{term}[/yellow], [green]found {len(temp_results)} results[/green]"
+                            f"[blue]Adding more results by searching for[/blue] [yellow]{series_name}[/yellow], [green]found {len(temp_results)} results[/green]"
+                        )
+
+                # Add more results using alternate names
+                new_search_terms = self.subtitle_utils.get_alternate_names(media_name)
+                if new_search_terms:
+                    for term in new_search_terms:
+                        temp_results = self.search(
+                            media_hash=hash,
+                            media_name=term,
+                            languages=language_choice,
                         )
+                        if temp_results:
+                            results.extend(temp_results)
+                            rprint(
+                                f"[blue]Adding more results by searching for[/blue] [yellow]{term}[/yellow], [green]found {len(temp_results)} results[/green]"
+                            )
 
             if not results:
                 rprint(f"[red]No subtitles found for {media_name}[/red]")
@@ -235,7 +280,7 @@ class OpenSubtitles:
                 )
 
             if selected_sub is None:
-                rprint("[yellow]Subtitle download cancelled.[/yellow]")
+                rprint(f"[yellow]{media_name}: Subtitle download cancelled.[/yellow]")
                 return False
 
             download_link = self.get_download_link(selected_sub)
@@ -263,31 +308,51 @@ class OpenSubtitles:
             return False
 
     def process_media_list(self, media_path_list, language_choice):
+        media_files = []
         for media_path in media_path_list:
             try:
                 path = Path(media_path)
                 if path.is_dir():
                     for file in path.iterdir():
                         if self.subtitle_utils.check_if_media_file(file):
-                            result = self.process_media_file(file, language_choice)
-                            if not result:
-                                self.console.print(
-                                    f"[bold yellow]Warning: Could not find subtitles for {file}[/]"
-                                )
+                            media_files.append(file)
                 elif self.subtitle_utils.check_if_media_file(path):
-                    result = self.process_media_file(path, language_choice)
-                    if not result:
-                        self.console.print(
-                            f"[bold yellow]Warning: Could not find subtitles for {path}[/]"
-                        )
+                    media_files.append(path)
             except Exception as e:
                 self.console.print(
                     f"[bold red]Unexpected error processing media list item {media_path}: {e}[/]"
                 )
 
+        def process(media_file, media_hash=None):
+            result = self.process_media_file(
+                media_file, language_choice, media_hash=media_hash
+            )
+            if not result:
+                self.console.print(
+                    f"[bold yellow]Warning: Could not find subtitles for {media_file}[/]"
+                )
+
+        # Files can only be processed concurrently when no user input is needed
+        if self.auto_select and self.sync_audio_to_subs != "ask":
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(executor.map(process, media_files))
+        else:
+            # Hash every file upfront in parallel, the prompts come one by one
+            hashes = self.subtitle_utils.hashFiles(media_files)
+            for media_file in media_files:
+                process(media_file, hashes[media_file])
+
     def print_subtitle_info(self, sub):
         try:
             attrs = sub["attributes"]
+
+            # Only render the full table for interactive or verbose runs
+            if not self.verbose and not self.console.is_terminal:
+                self.console.print(
+                    f"{attrs['release']} ({attrs['language']}, {attrs['download_count']} dl)"
+                )
+                return
+
             movie_name = attrs["feature_details"]["movie_name"]
 
             info_table = Table(title="Selected Subtitle Information", show_header=False)
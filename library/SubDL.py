@@ -1,13 +1,19 @@
 # SubDL.py is a class that handles subtitle search and download from SubDL API.
+import functools
+import io
+import os
+import shutil
+import threading
 import requests
+from urllib3.util.retry import Retry
 import zipfile
 from pathlib import Path
-import re
 import json
 from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
-from library.subtitle_utils import SubtitleUtils
+from library.subtitle_utils import MEDIA_SUFFIXES, SERIES_NAME_REGEX, SubtitleUtils
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import List, Dict, Any
 
@@ -19,6 +25,12 @@ class SearchResult:
 
 
 class SubDL:
+    # Number of media files processed concurrently in automatic mode
+    max_workers = 4
+    # Number of search responses kept in memory
+    search_cache_size = 256
+    # Shared result for failed searches, callers must not mutate its lists
+    _EMPTY = SearchResult(subtitles=[], metadata_results=[])
 
     def __init__(
         self,
@@ -26,16 +38,42 @@ class SubDL:
         sync_audio_to_subs=False,
         hearing_impaired=False,
         auto_select=True,
+        verbose=False,
     ):
         self.api_key = api_key
         self.sync_audio_to_subs = sync_audio_to_subs
         self.hearing_impaired = hearing_impaired
         self.auto_select = auto_select
+        self.verbose = verbose
         self.base_url = "https://api.subdl.com/api/v1/subtitles"
         self.download_base_url = "https://dl.subdl.com/subtitle/"
-        self.console = Console()
+        # Reuse connections (and their TLS handshakes) across API calls
+        self.session = requests.Session()
+        # Several files search concurrently, retry and back off when the API
+        # rate limits or fails transiently instead of reporting no subtitles
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self.session.mount("https://", adapter)
         self.subtitle_utils = SubtitleUtils()
         self.standardize_subtitle_objects = None
+        # Standardized subtitle objects keyed by subtitle id, reset per media list
+        self._std_cache = {}
+        # Successful search responses keyed by their query parameters
+        self._search_cache = {}
+        # Files are searched from several worker threads, guards the cache
+        self._search_cache_lock = threading.Lock()
+
+    @functools.cached_property
+    def console(self):
+        """Rich console, only created once something is printed"""
+        return Console()
 
     def search(
         self,
@@ -52,6 +90,7 @@ class SubDL:
         comment=False,
         releases=False,
         sd_id="",
+        fast_mode=False,
     ) -> SearchResult:
         """Search for subtitles using the SubDL API.
 
@@ -69,6 +108,8 @@ class SubDL:
             comment (bool): Include author comments
             releases (bool): Include releases list
             sd_id (str): Search by SubDL ID
+            fast_mode (bool): Return the raw SubDL subtitle objects and leave
+                standardization to the caller
         """
         params = {
             "api_key": self.api_key,
@@ -100,117 +141,161 @@ class SubDL:
             if value:
                 params[param] = value
 
+        cache_key = frozenset(params.items())
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-
-            if data["status"]:
-                subtitles = data.get("subtitles", [])
-                if subtitles:
+            with self._search_cache_lock:
+                data = self._search_cache.get(cache_key)
+            if data is None:
+                response = self.session.get(self.base_url, params=params, timeout=10)
+                response.raise_for_status()
+                data = response.json()
+
+                if not data["status"]:
                     self.console.print(
-                        f"[green]Found {len(subtitles)} subtitles[/green]"
+                        f"[bold red]Error: SubDL API returned error: {data.get('error', 'Unknown error')}[/]"
                     )
+                    return self._EMPTY
+
+                with self._search_cache_lock:
+                    if len(self._search_cache) >= self.search_cache_size:
+                        # Drop the oldest cached response
+                        self._search_cache.pop(next(iter(self._search_cache)), None)
+                    self._search_cache[cache_key] = data
+
+            # Copy, callers may extend the returned list
+            subtitles = list(data.get("subtitles", []))
+            if subtitles:
+                query = film_name or file_name or imdb_id or tmdb_id or sd_id
+                self.console.print(
+                    f"[green]Found {len(subtitles)} subtitles for[/green] [yellow]{query}[/yellow]"
+                )
 
-                # Standardize subtitle objects
-                self.standardize_subtitle_objects = [
-                    self.subtitle_utils.standardize_subtitle_object(sub, "subdl")
-                    for sub in subtitles
-                ]
-
+            if fast_mode:
                 return SearchResult(
-                    subtitles=self.standardize_subtitle_objects,
+                    subtitles=subtitles,
                     metadata_results=data.get("results", []),
                 )
 
-            self.console.print(
-                f"[bold red]Error: SubDL API returned error: {data.get('error', 'Unknown error')}[/]"
-            )
-            return SearchResult(subtitles=[], metadata_results=[])
+            # Standardize subtitle objects
+            self.standardize_subtitle_objects = [
+                self._standardize_subtitle(sub) for sub in subtitles
+            ]
 
-        except requests.exceptions.RequestException as e:
-            self.console.print(f"[bold red]Error during SubDL API request: {e}[/]")
-            return SearchResult(subtitles=[], metadata_results=[])
-        except (KeyError, json.decoder.JSONDecodeError) as e:
-            self.console.print(f"[bold red]Error decoding SubDL API response: {e}[/]")
-            return SearchResult(subtitles=[], metadata_results=[])
+            return SearchResult(
+                subtitles=self.standardize_subtitle_objects,
+                metadata_results=data.get("results", []),
+            )
         except Exception as e:
-            self.console.print(f"[bold red]Unexpected error in SubDL search: {e}[/]")
-            return SearchResult(subtitles=[], metadata_results=[])
+            self._log_search_error(e)
+            return self._EMPTY
+
+    def _log_search_error(self, error):
+        """Print a search error according to where it was raised"""
+        if isinstance(error, requests.exceptions.RequestException):
+            message = "Error during SubDL API request"
+        elif isinstance(error, (KeyError, json.decoder.JSONDecodeError)):
+            message = "Error decoding SubDL API response"
+        else:
+            message = "Unexpected error in SubDL search"
+        self.console.print(f"[bold red]{message}: {error}[/]")
+
+    def _standardize_subtitle(self, subtitle):
+        """Standardize a raw SubDL subtitle object, reusing cached results"""
+        subtitle_id = self.subtitle_utils.extract_subdl_subtitle_id(
+            subtitle.get("url", "")
+        )
+        standardized = self._std_cache.get(subtitle_id)
+        if standardized is None:
+            standardized = self.subtitle_utils.standardize_subtitle_object(
+                subtitle, "subdl"
+            )
+            if subtitle_id is not None:
+                self._std_cache[subtitle_id] = standardized
+        return standardized
 
     def download_single_subtitle(
         self, subtitle_id, video_input_path, language_choice=""
     ):
         download_url = f"{self.download_base_url}{subtitle_id}"
         try:
-            response = requests.get(download_url, stream=True, timeout=10)
+            response = self.session.get(download_url, stream=True, timeout=10)
             response.raise_for_status()
-            zip_path = video_input_path.with_suffix(".zip")
-            with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            # Generate the desired subtitle filename
+            # Keep the archive in memory, copying straight from the raw stream
+            # in 64 KiB blocks
+            response.raw.decode_content = True
+            zip_buffer = io.BytesIO()
+            shutil.copyfileobj(response.raw, zip_buffer, length=65536)
+
+            # Generate the desired subtitle filename base, the extension is
+            # picked once we know which subtitle format the archive contains
+            base_filename = video_input_path.stem
             if language_choice:
-                subtitle_filename = f"{video_input_path.stem}.{language_choice}.ass"
-                fallback_filename = f"{video_input_path.stem}.{language_choice}.srt"
-            else:
-                subtitle_filename = f"{video_input_path.stem}.ass"
-                fallback_filename = f"{video_input_path.stem}.srt"
+                base_filename = f"{base_filename}.{language_choice}"
 
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            with zipfile.ZipFile(zip_buffer, "r") as zip_ref:
                 extracted_files = zip_ref.namelist()
 
-                ass_files = [f for f in extracted_files if f.endswith(".ass")]
-                srt_files = [f for f in extracted_files if f.endswith(".srt")]
+                # Partition the archive members in a single pass
+                ass_files, srt_files = [], []
+                for f in extracted_files:
+                    suffix = f[-4:].lower()
+                    if suffix == ".ass":
+                        ass_files.append(f)
+                    elif suffix == ".srt":
+                        srt_files.append(f)
 
                 if ass_files:
                     selected_file = ass_files[0]
-                    target_filename = subtitle_filename
+                    target_filename = f"{base_filename}.ass"
                 elif srt_files:
                     selected_file = srt_files[0]
-                    target_filename = fallback_filename
+                    target_filename = f"{base_filename}.srt"
                 else:
                     self.console.print(
                         "[bold red]Error: No .ass or .srt subtitle files found in the archive.[/]"
                     )
                     return None
 
+                target_path = os.path.join(
+                    str(video_input_path.parent), target_filename
+                )
+
                 # Read subtitle content with encoding detection
-                with zip_ref.open(selected_file) as source:
-                    content = source.read()
-
-                    # Try different encodings
-                    encodings = ["utf-8", "utf-16", "cp1252", "iso-8859-1", "latin1"]
-                    decoded_content = None
-
-                    for encoding in encodings:
-                        try:
-                            decoded_content = content.decode(encoding)
-                            break
-                        except UnicodeDecodeError:
-                            continue
-
-                    if decoded_content is None:
-                        self.console.print(
-                            "[bold red]Error: Failed to decode subtitle file with any known encoding[/]"
-                        )
-                        return None
+                content = zip_ref.read(selected_file)
 
+                # Try different encodings
+                encodings = ["utf-8", "utf-16", "cp1252", "iso-8859-1", "latin1"]
+                decoded_content = None
+
+                for encoding in encodings:
+                    try:
+                        decoded_content = content.decode(encoding)
+                        break
+                    except UnicodeDecodeError:
+                        continue
+
+                if decoded_content is None:
+                    self.console.print(
+                        "[bold red]Error: Failed to decode subtitle file with any known encoding[/]"
+                    )
+                    return None
+
+                if encoding == "utf-8":
+                    # Already UTF-8, write the raw bytes (minus any BOM)
+                    if content[:3] == b"\xef\xbb\xbf":
+                        content = content[3:]
+                    with open(target_path, "wb") as target:
+                        target.write(content)
+                else:
                     # Write with UTF-8 encoding
-                    with open(
-                        video_input_path.parent / target_filename, "w", encoding="utf-8"
-                    ) as target:
+                    with open(target_path, "w", encoding="utf-8") as target:
                         target.write(decoded_content)
 
                 self.console.print(
                     f"[green]Subtitle downloaded and saved as: {target_filename}[/green]"
                 )
 
-            # Clean up the zip file
-            zip_path.unlink()
-
-            return video_input_path.parent / target_filename
+            return Path(target_path)
 
         except requests.exceptions.RequestException as e:
             self.console.print(f"[bold red]Error downloading subtitle: {e}[/]")
@@ -227,7 +312,6 @@ class SubDL:
     def process_media_file(self, media_path, language_choice, media_name=""):
         try:
             path = Path(media_path)
-            hash = self.subtitle_utils.hashFile(path)
             if not media_name:
                 media_name = path.stem
             rprint(
@@ -235,20 +319,22 @@ class SubDL:
             )
             subtitle_path = Path(path.parent, f"{path.stem}.{language_choice}.srt")
 
-            # Initial search by filename
+            # Initial search by filename. All searches run in fast mode, results
+            # are standardized once after duplicates have been removed
             search_results = self.search(
-                file_name=media_name, languages=language_choice
+                file_name=media_name, languages=language_choice, fast_mode=True
             )
-            subtitles_list = search_results.subtitles
+            # Copy, the list is extended below and may be the shared _EMPTY one
+            subtitles_list = list(search_results.subtitles)
             if not subtitles_list:
                 rprint(f"[red]No subtitles found for {media_name}[/red]")
             else:
-                rprint(f"[green]Found {len(subtitles_list)} results[/green]")
+                rprint(
+                    f"[yellow]{media_name}[/yellow]: [green]Found {len(subtitles_list)} results[/green]"
+                )
 
             # parse series name and search for subtitles by series name alone series name exapmle: "The Flash 2014", "Dune - Prophecy (2024) - S01E01 - - The Hidden Hand [AMZN WEBDL-1080p][8bit][h264][EAC3 5.1]-playWEB"
-            series_name = re.search(
-                r"(.+?)(?:\s-\sS\d{2}E\d{2}|\s-\s\d{4})", media_name
-            )
+            series_name = SERIES_NAME_REGEX.search(media_name)
 
             if series_name:
                 series_name = series_name.group(1)
@@ -256,13 +342,15 @@ class SubDL:
                     f"[cyan]Searching for subtitles for series[/cyan] [yellow]{series_name}[/yellow]"
                 )
                 series_name_search_results = self.search(
-                    film_name=series_name, languages=language_choice
+                    film_name=series_name, languages=language_choice, fast_mode=True
                 )
                 subtitles_list.extend(series_name_search_results.subtitles)
                 if not subtitles_list:
                     rprint(f"[red]No subtitles found for {series_name}[/red]")
                 else:
-                    rprint(f"[green]Found {len(subtitles_list)} results[/green]")
+                    rprint(
+                        f"[yellow]{media_name}[/yellow]: [green]Found {len(subtitles_list)} results[/green]"
+                    )
 
             # Second pass - search by IMDb IDs
             imdb_ids = set()
@@ -275,7 +363,7 @@ class SubDL:
             # Search for each IMDb ID
             for imdb_id in imdb_ids:
                 imdb_results = self.search(
-                    imdb_id=imdb_id, languages=language_choice
+                    imdb_id=imdb_id, languages=language_choice, fast_mode=True
                 ).subtitles
                 if imdb_results:
                     subtitles_list.extend(imdb_results)
@@ -290,6 +378,7 @@ class SubDL:
                     temp_results = self.search(
                         file_name=term,
                         languages=language_choice,
+                        fast_mode=True,
                     ).subtitles
                     if temp_results:
                         subtitles_list.extend(temp_results)
@@ -301,10 +390,16 @@ class SubDL:
                 rprint(f"[red]No subtitles found for {media_name}[/red]")
                 return False
 
-            # Remove duplicates
-            subtitles_list = list({v["id"]: v for v in subtitles_list}.values())
+            # Remove duplicates, then standardize each unique subtitle once
+            unique_subtitles = {
+                self.subtitle_utils.extract_subdl_subtitle_id(v.get("url", "")): v
+                for v in subtitles_list
+            }
+            subtitles_list = [
+                self._standardize_subtitle(v) for v in unique_subtitles.values()
+            ]
             rprint(
-                f"[green]Total unique results after all searches: {len(subtitles_list)}[/green]"
+                f"[yellow]{media_name}[/yellow]: [green]Total unique results after all searches: {len(subtitles_list)}[/green]"
             )
 
             if self.auto_select:
@@ -317,7 +412,7 @@ class SubDL:
                 )
 
             if selected_sub is None:
-                rprint("[yellow]Subtitle download cancelled.[/yellow]")
+                rprint(f"[yellow]{media_name}: Subtitle download cancelled.[/yellow]")
                 return False
 
             subtitle_path = self.download_single_subtitle(
@@ -344,24 +439,54 @@ class SubDL:
             )
             return False
 
-    def process_media_list(self, media_path_list, language_choice):
+    def iter_media_files(self, media_path_list):
+        """Yield every media file in media_path_list, walking each directory
+        once and skipping hidden directories"""
         for media_path in media_path_list:
             try:
                 path = Path(media_path)
                 if path.is_dir():
-                    for file_path in path.glob("**/*"):
-                        if file_path.suffix.lower() in [".mp4", ".mkv", ".avi"]:
-                            self.process_media_file(str(file_path), language_choice)
-                elif path.suffix.lower() in [".mp4", ".mkv", ".avi"]:
-                    self.process_media_file(str(path), language_choice)
+                    for root, dirs, files in os.walk(path):
+                        dirs[:] = [d for d in dirs if not d.startswith(".")]
+                        for file_name in files:
+                            if os.path.splitext(file_name)[1].lower() in MEDIA_SUFFIXES:
+                                yield os.path.join(root, file_name)
+                elif path.suffix.lower() in MEDIA_SUFFIXES:
+                    yield str(path)
             except Exception as e:
                 self.console.print(
                     f"[bold red]Unexpected error processing media list item {media_path}: {e}[/]"
                 )
 
+    def process_media_list(self, media_path_list, language_choice):
+        media_files = self.iter_media_files(media_path_list)
+        self._std_cache.clear()
+        # Files can only be processed concurrently when no user input is needed
+        if self.auto_select and self.sync_audio_to_subs != "ask":
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                list(
+                    executor.map(
+                        lambda media_file: self.process_media_file(
+                            media_file, language_choice
+                        ),
+                        media_files,
+                    )
+                )
+        else:
+            for media_file in media_files:
+                self.process_media_file(media_file, language_choice)
+
     def print_subtitle_info(self, sub):
         try:
             attrs = sub["attributes"]
+
+            # Only render the full table for interactive or verbose runs
+            if not self.verbose and not self.console.is_terminal:
+                self.console.print(
+                    f"{attrs['release']} ({attrs['language']}, {attrs['download_count']} dl)"
+                )
+                return
+
             # movie_name = attrs["feature_details"]["movie_name"]
 
             info_table = Table(title="Selected Subtitle Information", show_header=False)
@@ -1,8 +1,16 @@
 import os
 import re
+import functools
 import configparser
 from pathlib import Path
 
+# google-re2 matches the ads alternation as a DFA in linear time, fall back to
+# the standard library when it is not installed
+try:
+    import re2 as ads_re
+except ImportError:
+    ads_re = re
+
 
 def read_file(_file_path):
     """
@@ -37,31 +45,41 @@ def get_ads_list(_ads_file_path, ads_separator=","):
     return _ads_to_remove
 
 
+@functools.lru_cache(maxsize=8)
+def compile_ads_regex(_ads_to_remove):
+    """
+    build a single regex matching every line that starts with one of the ads
+    :param _ads_to_remove: tuple of ads, matched literally
+    :return: the compiled regex, or None if there are no ads
+    """
+    # clean _ads_to_remove from empty strings
+    _escaped_ads = [re.escape(ad) for ad in _ads_to_remove if ad]
+    if not _escaped_ads:
+        return None
+    # inline flags so the same pattern works with both re and re2
+    _pattern = r"(?im)^(?:" + "|".join(_escaped_ads) + r").*$"
+    try:
+        return ads_re.compile(_pattern)
+    except ads_re.error:
+        return re.compile(_pattern)
+
+
 def clean_ads_regex(_subtitle_file_path, _ads_to_remove):
     full_path = Path(_subtitle_file_path)
-    directory_name = full_path.parent
-    file_name = full_path.stem
-    file_extension = full_path.suffix
+
+    ads_regex = compile_ads_regex(tuple(_ads_to_remove))
+    if ads_regex is None:
+        return
 
     _content = read_file(full_path.absolute())
-    between_brackets_regex = r"\[([^]]+)\]"
-    # clean _ads_to_remove from empty strings
-    _ads_to_remove = [ad for ad in _ads_to_remove if ad]
-
-    # create a dynamic regex based on the start of each ad.
-    regex_list = []
-    for _ad in _ads_to_remove:
-        regex_list.append(f"(^{_ad}.*$)")
-
-    join_ads_regex = "|".join(map(re.escape, regex_list)).replace("\\", "")
-    _file_content = re.sub(
-        pattern=join_ads_regex,
-        repl="",
-        string=_content,
-        flags=re.MULTILINE | re.IGNORECASE,
-    )
-
-    # result = re.findall(join_ads_regex, _text, re.MULTILINE)
+    _file_content, _ads_removed = ads_regex.subn("", _content)
+
+    # result = ads_regex.findall(_content)
+
+    # only rewrite the file when there was something to remove
+    if not _ads_removed:
+        print(f"{full_path.absolute()} has no ads.")
+        return
 
     save_file(full_path.absolute(), _file_content)
     print(f"{full_path.absolute()} cleaned!")
@@ -2,28 +2,159 @@
 
 import re
 import os
-import struct
-from pathlib import Path
-from thefuzz import fuzz
+import stat
+import functools
+import mmap
+from rapidfuzz import fuzz, process, utils
 from rich.console import Console
 from rich.table import Table
-import pickle
+import json
 import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import library.clean_subtitles as clean_subtitles
 import library.sync_subtitles as sync_subtitles
 
 # ================================ Paths =============================
 CURRENT_DIR_PATH = os.path.dirname(os.path.realpath(__file__))
-TOKEN_STORAGE_FILE = os.path.join(CURRENT_DIR_PATH, "token.pkl")
+TOKEN_STORAGE_FILE = os.path.join(CURRENT_DIR_PATH, "token.json")
+# Tokens used to be pickled here, removed once a json token is saved
+LEGACY_TOKEN_STORAGE_FILE = os.path.join(CURRENT_DIR_PATH, "token.pkl")
 # ====================================================================
 
+# ============================= Media ================================
+MEDIA_SUFFIXES = frozenset({".mp4", ".mkv", ".avi"})
+# ====================================================================
+
+# ================================ Regex =============================
+FILENAME_SEPARATORS_REGEX = re.compile(r"[\-\_\[\]\(\)\{\}\s\.]+")
+SERIES_NAME_SPLIT_REGEX = re.compile(
+    r"s\d{1,2}e\d{1,2}|season|episode|\d{3,4}p|\b\d{4}\b"
+)
+IMPLICIT_S1_REGEX = re.compile(
+    r"\.e(?P<e>\d{1,2})\."  # .E01.
+    r"|\.ep(?P<ep>\d{1,2})\."  # .EP01.
+    r"|episode\.(?P<episode>\d{1,2})"  # episode.01
+)
+WORD_SPLIT_REGEX = re.compile(r"[.\s_-]")
+# Series name used for the fallback searches, e.g. "The Flash 2014" or
+# "Dune - Prophecy (2024)" out of "Dune - Prophecy (2024) - S01E01 - ..."
+SERIES_NAME_REGEX = re.compile(r"(.+?)(?:\s-\sS\d{2}E\d{2}|\s-\s\d{4})")
+# Season/episode formats, tried in order, the first one that matches wins
+SEASON_EPISODE_REGEXES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        # Standard formats
+        r"[Ss](\d{1,2})[Ee](\d{1,2})",  # S01E02, s1e2
+        r"[Ss](\d{1,2})\s*-\s*[Ee](\d{1,2})",  # S01-E02
+        r"(\d{1,2})x(\d{1,2})",  # 1x02
+        r"(?:Episode|Ep)\s*(\d{1,2})",  # Episode 2, Ep 2 (implies S1)
+        r"[Ee](\d{1,2})",  # E02 (implies S1)
+        r"[Ee][Pp](\d{1,2})",  # EP02 (implies S1)
+        # More specific formats
+        r"\s-\s*[Ss](\d{1,2})[Ee](\d{1,2})",  # - S01E02
+        r"[Ss]eason\s*(\d{1,2})\s*[Ee]pisode\s*(\d{1,2})",  # Season 1 Episode 2
+        r"[Ss](\d{1,2})\s*[Ee]p\s*(\d{1,2})",  # S01 Ep 02
+        # Date-based formats for daily shows
+        r"(\d{4})\.(\d{2}\.\d{2})",  # 2024.01.02
+        r"(\d{4})-(\d{2}-\d{2})",  # 2024-01-02
+        # Special formats
+        r"Episode\s#(\d+)\.(\d+)",  # Episode #1.2
+        r"E(\d{1,2})",  # E1 (implies S1)
+    )
+)
+# Season/episode tags stripped from a media name to get its title, all
+# removed in a single pass
+EPISODE_TAG_REGEX = re.compile(
+    r"[Ss]\d{1,2}[Ee]\d{1,2}"
+    r"|[Ss]\d{1,2}\s*-\s*[Ee]\d{1,2}"
+    r"|\d{1,2}x\d{1,2}"
+    r"|(?:Episode|Ep)\s*\d{1,2}"
+    r"|[Ee]\d{1,2}"
+    r"|[Ee][Pp]\d{1,2}",
+    re.IGNORECASE,
+)
+YEAR_REGEX = re.compile(r"\((\d{4})\)")
+YEAR_STRIP_REGEX = re.compile(r"\s*\(\d{4}\)\s*")
+# ====================================================================
+
+# ============================= Scoring ==============================
+# Quality terms, 5 points each when both names mention them
+QUALITY_TERMS = frozenset(
+    {"hdtv", "720p", "1080p", "2160p", "4k", "webdl", "webrip", "bluray", "hdrip"}
+)
+# Quality indicators, 10 more points each when both names mention them
+QUALITY_INDICATORS = frozenset({"hdtv", "720p", "1080p", "webdl", "webrip"})
+# ====================================================================
+
+# Same scorer the fuzzy matching always used with thefuzz, token_sort_ratio
+# keeps the old scores. token_set_ratio would give a bare title like "Flash"
+# a perfect 100 against any release that contains it
+SIMILARITY_SCORER = fuzz.token_sort_ratio
+
+
+def _fadvise(fd, offset, length, advice):
+    """Best effort posix_fadvise, the advice is only a hint so platforms
+    without it and filesystems rejecting it (EINVAL/ENOSYS) are ignored"""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(fd, offset, length, getattr(os, advice))
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1024)
+def _extract_season_and_episode(media_name):
+    """Cached season/episode parsing, the same names (video and release names)
+    are parsed again on every search and selection"""
+    if not media_name:
+        return None, None
+
+    # Normalize input string
+    media_name = media_name.replace("_", " ").replace(".", " ")
+
+    for pattern in SEASON_EPISODE_REGEXES:
+        match = pattern.search(media_name)
+        if match:
+            groups = match.groups()
+
+            # Handle special cases
+            if len(groups) == 1:  # Single number patterns imply Season 1
+                return 1, int(groups[0])
+
+            if len(groups) == 2:
+                season = groups[0]
+                episode = groups[1]
+
+                # Handle date-based formats
+                if len(season) == 4:  # Year-based format
+                    return 1, int(episode.replace(".", "").replace("-", ""))
+
+                try:
+                    return int(season), int(episode)
+                except (ValueError, TypeError):
+                    continue
+
+    return None, None
+
+
+@functools.lru_cache(maxsize=1024)
+def _clean_file_name(file_name):
+    """Cached clean_file_name, release names come back in several searches"""
+    return FILENAME_SEPARATORS_REGEX.sub(" ", file_name).lower()
+
 
 class SubtitleUtils:
-    console = Console()
 
     def __init__(self):
         pass
 
+    @functools.cached_property
+    def console(self):
+        """Rich console, only created once something is printed"""
+        return Console()
+
     def extract_subdl_subtitle_id(self, url):
         if not url:
             return None
@@ -70,18 +201,34 @@ class SubtitleUtils:
                 "timestamp": time.time(),
             }  # Store the current timestamp
 
-            # Save the data to a pickle file
-            with open(TOKEN_STORAGE_FILE, "wb") as file:
-                pickle.dump(data, file)
+            # Save the data to a json file, written to a temp file of its own
+            # next to it first and then swapped in, so neither a crash nor
+            # another run writing at the same time can leave a broken token
+            fd, temp_file = tempfile.mkstemp(
+                dir=CURRENT_DIR_PATH, prefix="token.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "w") as file:
+                    json.dump(data, file)
+                os.replace(temp_file, TOKEN_STORAGE_FILE)
+            except BaseException:
+                os.unlink(temp_file)
+                raise
+
+            # Don't leave the old pickled credential behind
+            try:
+                os.remove(LEGACY_TOKEN_STORAGE_FILE)
+            except FileNotFoundError:
+                pass
         except Exception as e:
             self.console.print(f"[bold red]Error saving token: {e}[/]")
 
     def read_token(self):
         try:
-            # Check if the pickle file exists
+            # Check if the json file exists
             if os.path.exists(TOKEN_STORAGE_FILE):
-                with open(TOKEN_STORAGE_FILE, "rb") as file:
-                    data = pickle.load(file)
+                with open(TOKEN_STORAGE_FILE, "r") as file:
+                    data = json.load(file)
 
                 # Get the timestamp and current time
                 timestamp = data["timestamp"]
@@ -93,7 +240,7 @@ class SubtitleUtils:
 
             # If the file doesn't exist or the token is too old, return False
             return False
-        except (FileNotFoundError, EOFError, pickle.UnpicklingError) as e:
+        except (FileNotFoundError, KeyError, json.JSONDecodeError) as e:
             self.console.print(f"[bold yellow]Warning: Error reading token: {e}[/]")
             return False
         except Exception as e:
@@ -114,23 +261,15 @@ class SubtitleUtils:
 
     def sort_list_of_dicts_by_key(self, input_list, key_to_sort_by):
         try:
-            # Create an empty set to store unique 'id' values
-            unique_ids = set()
-
-            # Initialize an empty list to store unique items
-            unique_data = []
-
-            # Iterate through the list of dictionaries
+            # Keep the first item of every 'id', in their original order
+            unique_data = {}
             for item in input_list:
-                item_id = item["id"]
-
-                # Check if the 'id' is not already in the set of unique_ids
-                if item_id not in unique_ids:
-                    unique_ids.add(item_id)
-                    unique_data.append(item)
+                unique_data.setdefault(item["id"], item)
 
             sorted_list = sorted(
-                unique_data, key=lambda x: x["attributes"][key_to_sort_by], reverse=True
+                unique_data.values(),
+                key=lambda x: x["attributes"][key_to_sort_by],
+                reverse=True,
             )
             return sorted_list
         except (KeyError, TypeError) as e:
@@ -144,10 +283,6 @@ class SubtitleUtils:
         """Produce a hash for a video file: size + 64bit chksum of the first and
         last 64k (even if they overlap because the file is smaller than 128k)"""
         try:
-            longlongformat = "Q"  # unsigned long long little endian
-            bytesize = struct.calcsize(longlongformat)
-            fmt = "<%d%s" % (65536 // bytesize, longlongformat)
-
             with open(media_path, "rb") as f:
                 filesize = os.fstat(f.fileno()).st_size
                 filehash = filesize
@@ -158,14 +293,39 @@ class SubtitleUtils:
                     )
                     return "SizeError"
 
-                buf = f.read(65536)
-                longlongs = struct.unpack(fmt, buf)
-                filehash += sum(longlongs)
-
-                f.seek(-65536, os.SEEK_END)  # size is always > 131072
-                buf = f.read(65536)
-                longlongs = struct.unpack(fmt, buf)
-                filehash += sum(longlongs)
+                # Positional reads of both blocks, no seek in between. Windows
+                # has no pread, map the file once and slice them out instead
+                if hasattr(os, "pread"):
+                    fd = f.fileno()
+                    # Only two blocks of a possibly huge file are needed, skip
+                    # the readahead and don't keep them in the page cache
+                    _fadvise(fd, 0, 0, "POSIX_FADV_RANDOM")
+                    head = os.pread(fd, 65536, 0)
+                    tail = os.pread(fd, 65536, filesize - 65536)
+                    _fadvise(fd, 0, 65536, "POSIX_FADV_DONTNEED")
+                    _fadvise(fd, filesize - 65536, 65536, "POSIX_FADV_DONTNEED")
+                else:
+                    try:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            head = mm[:65536]
+                            tail = mm[filesize - 65536 :]  # size is always > 131072
+                    except (OSError, ValueError):
+                        # Some network filesystems can't be mapped, plain reads
+                        f.seek(0)
+                        head = f.read(65536)
+                        f.seek(filesize - 65536)
+                        tail = f.read(65536)
+
+                # numpy is only needed here, importing it lazily keeps it out of
+                # the startup before the interactive menus show up
+                import numpy as np
+
+                # Sum each block as unsigned 64bit little endian integers, the
+                # uint64 sum wraps around which is fine since we mask anyway
+                for buf in (head, tail):
+                    filehash += int(
+                        np.frombuffer(buf, dtype="<u8").sum(dtype=np.uint64)
+                    )
                 filehash &= 0xFFFFFFFFFFFFFFFF
 
             returnedhash = "%016x" % filehash
@@ -182,57 +342,16 @@ class SubtitleUtils:
             )
             return None
 
+    def hashFiles(self, media_paths, max_workers=8):
+        """Hash several video files at once, the reads are tiny so the time
+        goes to disk/network latency which overlaps across threads"""
+        media_paths = list(media_paths)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(media_paths, executor.map(self.hashFile, media_paths)))
+
     def extract_season_and_episode(self, media_name):
         """Extract season and episode numbers from media name using multiple formats"""
-        if not media_name:
-            return None, None
-
-        # Normalize input string
-        media_name = media_name.replace("_", " ").replace(".", " ")
-
-        patterns = [
-            # Standard formats
-            r"[Ss](\d{1,2})[Ee](\d{1,2})",  # S01E02, s1e2
-            r"[Ss](\d{1,2})\s*-\s*[Ee](\d{1,2})",  # S01-E02
-            r"(\d{1,2})x(\d{1,2})",  # 1x02
-            r"(?:Episode|Ep)\s*(\d{1,2})",  # Episode 2, Ep 2 (implies S1)
-            r"[Ee](\d{1,2})",  # E02 (implies S1)
-            r"[Ee][Pp](\d{1,2})",  # EP02 (implies S1)
-            # More specific formats
-            r"\s-\s*[Ss](\d{1,2})[Ee](\d{1,2})",  # - S01E02
-            r"[Ss]eason\s*(\d{1,2})\s*[Ee]pisode\s*(\d{1,2})",  # Season 1 Episode 2
-            r"[Ss](\d{1,2})\s*[Ee]p\s*(\d{1,2})",  # S01 Ep 02
-            # Date-based formats for daily shows
-            r"(\d{4})\.(\d{2}\.\d{2})",  # 2024.01.02
-            r"(\d{4})-(\d{2}-\d{2})",  # 2024-01-02
-            # Special formats
-            r"Episode\s#(\d+)\.(\d+)",  # Episode #1.2
-            r"E(\d{1,2})",  # E1 (implies S1)
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, media_name, re.IGNORECASE)
-            if match:
-                groups = match.groups()
-
-                # Handle special cases
-                if len(groups) == 1:  # Single number patterns imply Season 1
-                    return 1, int(groups[0])
-
-                if len(groups) == 2:
-                    season = groups[0]
-                    episode = groups[1]
-
-                    # Handle date-based formats
-                    if len(season) == 4:  # Year-based format
-                        return 1, int(episode.replace(".", "").replace("-", ""))
-
-                    try:
-                        return int(season), int(episode)
-                    except (ValueError, TypeError):
-                        continue
-
-        return None, None
+        return _extract_season_and_episode(media_name)
 
     def get_alternate_names(self, media_name):
         """Generate alternate name formats for the media"""
@@ -247,24 +366,13 @@ class SubtitleUtils:
 
             # Extract title and year, now knowing where season/episode info is
             # Remove common episode/season patterns
-            clean_name = media_name
-            patterns_to_remove = [
-                r"[Ss]\d{1,2}[Ee]\d{1,2}",
-                r"[Ss]\d{1,2}\s*-\s*[Ee]\d{1,2}",
-                r"\d{1,2}x\d{1,2}",
-                r"(?:Episode|Ep)\s*\d{1,2}",
-                r"[Ee]\d{1,2}",
-                r"[Ee][Pp]\d{1,2}",
-            ]
-
-            for pattern in patterns_to_remove:
-                clean_name = re.sub(pattern, "", clean_name, flags=re.IGNORECASE)
+            clean_name = EPISODE_TAG_REGEX.sub("", media_name)
 
             # Extract year if present
-            year_match = re.search(r"\((\d{4})\)", clean_name)
+            year_match = YEAR_REGEX.search(clean_name)
             year = year_match.group(1) if year_match else ""
             if year:
-                clean_name = re.sub(r"\s*\(\d{4}\)\s*", " ", clean_name)
+                clean_name = YEAR_STRIP_REGEX.sub(" ", clean_name)
 
             # Clean up title
             title = clean_name.strip().strip(".-_ ")
@@ -344,83 +452,116 @@ class SubtitleUtils:
             self.console.print(f"[bold red]Error normalizing score: {e}[/]")
             return 0
 
-    def score_subtitle(self, subtitle_release_name, video_file_name, hash_match=False):
-        """Score subtitle match against video filename"""
+    def clean_file_name(self, file_name):
+        """Lowercase a file/release name and collapse separators into spaces"""
+        return _clean_file_name(file_name)
+
+    def batch_similarity(self, video_file_clean, release_names_clean):
+        """Fuzzy similarity of every cleaned release name against the cleaned
+        video filename, computed in a single rapidfuzz call"""
+        similarities = process.cdist(
+            [video_file_clean],
+            release_names_clean,
+            scorer=SIMILARITY_SCORER,
+            processor=utils.default_process,
+            score_cutoff=40,
+            dtype="float64",
+        )[0]
+        return [round(similarity) for similarity in similarities.tolist()]
+
+    def prepare_video_name(self, video_file_name):
+        """Precompute the video side of score_subtitle, it is the same for
+        every candidate subtitle"""
+        video_file_clean = _clean_file_name(video_file_name)
+        video_file_parts = WORD_SPLIT_REGEX.split(video_file_clean)
+        series_name_parts = video_file_parts[:3]
+        season, episode = _extract_season_and_episode(video_file_name)
+
+        # Points a matching subtitle word earns, summed over every occurrence
+        # of that word in the video filename
+        word_points = {}
+        for file_part in video_file_parts:
+            points = 5 if file_part in series_name_parts else 1
+            word_points[file_part] = word_points.get(file_part, 0) + points
+
+        return {
+            "clean": video_file_clean,
+            "series_name": SERIES_NAME_SPLIT_REGEX.split(video_file_clean)[0].strip(),
+            "word_points": word_points,
+            "is_implicit_s1": bool(IMPLICIT_S1_REGEX.search(video_file_clean)),
+            # Only the terms the video has can match a subtitle
+            "quality_terms": QUALITY_TERMS.intersection(video_file_parts),
+            "quality_indicators": QUALITY_INDICATORS.intersection(video_file_parts),
+            "season": season,
+            "episode": episode,
+        }
+
+    def score_subtitle(
+        self,
+        subtitle_release_name,
+        video_file_name,
+        hash_match=False,
+        similarity=None,
+        video_info=None,
+        sub_file_clean=None,
+    ):
+        """Score subtitle match against video filename, similarity, video_info
+        and sub_file_clean can be precomputed, see score_subtitles"""
         try:
             score = 0
 
             if not subtitle_release_name or not video_file_name:
                 return 0
 
-            # Hash match is strongest indicator
+            # Hash match is strongest indicator, it is the same video file so
+            # skip the name comparisons and give it the top normalized score
             if hash_match:
-                score += 100
+                return 100.0
+
+            if video_info is None:
+                video_info = self.prepare_video_name(video_file_name)
 
             # Normalize filenames
-            video_file_clean = re.sub(
-                r"[\-\_\[\]\(\)\{\}\s\.]+", " ", video_file_name
-            ).lower()
-            sub_file_clean = re.sub(
-                r"[\-\_\[\]\(\)\{\}\s\.]+", " ", subtitle_release_name
-            ).lower()
+            video_file_clean = video_info["clean"]
+            if sub_file_clean is None:
+                sub_file_clean = _clean_file_name(subtitle_release_name)
 
             # Extract series name
-            series_name = re.split(
-                r"s\d{1,2}e\d{1,2}|season|episode|\d{3,4}p|\b\d{4}\b", video_file_clean
-            )[0].strip()
+            series_name = video_info["series_name"]
 
             # Series name match (max 55)
             if series_name and series_name in sub_file_clean:
                 score += 55
 
             # Quality term matches (max 45: 9 terms × 5 points)
-            quality_score = 0
-            quality_terms = [
-                "hdtv",
-                "720p",
-                "1080p",
-                "2160p",
-                "4k",
-                "webdl",
-                "webrip",
-                "bluray",
-                "hdrip",
-            ]
-            for term in quality_terms:
-                if term in video_file_clean and term in sub_file_clean:
-                    quality_score += 5
+            sub_file_parts = WORD_SPLIT_REGEX.split(sub_file_clean)
+            sub_file_words = set(sub_file_parts)
+            quality_score = 5 * len(video_info["quality_terms"] & sub_file_words)
             score += min(quality_score, 45)
 
             # Handle implicit season 1
-            implicit_s1_patterns = [
-                r"\.e(\d{1,2})\.",  # .E01.
-                r"\.ep(\d{1,2})\.",  # .EP01.
-                r"episode\.(\d{1,2})",  # episode.01
-            ]
-            video_is_implicit_s1 = any(
-                re.search(pattern, video_file_clean) for pattern in implicit_s1_patterns
-            )
-            sub_is_implicit_s1 = any(
-                re.search(pattern, sub_file_clean) for pattern in implicit_s1_patterns
-            )
+            video_is_implicit_s1 = video_info["is_implicit_s1"]
+            sub_is_implicit_s1 = bool(IMPLICIT_S1_REGEX.search(sub_file_clean))
 
             # Word matching (max 30)
             word_match_score = 0
-            video_file_parts = re.split(r"[.\s_-]", video_file_clean)
-            sub_file_parts = re.split(r"[.\s_-]", sub_file_clean)
-            series_name_parts = video_file_parts[:3]
-
+            word_points = video_info["word_points"]
             for sub_part in sub_file_parts:
-                for file_part in video_file_parts:
-                    if sub_part == file_part:
-                        if file_part in series_name_parts:
-                            word_match_score += 5
-                        else:
-                            word_match_score += 1
+                if sub_part in word_points:
+                    word_match_score += word_points[sub_part]
             score += min(word_match_score, 30)
 
-            # Fuzzy matching (max 100)
-            similarity = fuzz.token_sort_ratio(video_file_clean, sub_file_clean)
+            # Fuzzy matching (max 100), anything up to 40 scores nothing so let
+            # rapidfuzz bail out early on implausible candidates
+            if similarity is None:
+                similarity = round(
+                    SIMILARITY_SCORER(
+                        video_file_clean,
+                        sub_file_clean,
+                        processor=utils.default_process,
+                        score_cutoff=40,
+                    )
+                )
             if similarity == 100:
                 score += 100
             elif similarity > 90:
@@ -431,10 +572,9 @@ class SubtitleUtils:
                 score += 10
 
             # Episode/Season matching
-            season_source, episode_source = self.extract_season_and_episode(
-                video_file_name
-            )
-            season_target, episode_target = self.extract_season_and_episode(
+            season_source = video_info["season"]
+            episode_source = video_info["episode"]
+            season_target, episode_target = _extract_season_and_episode(
                 subtitle_release_name
             )
 
@@ -452,11 +592,9 @@ class SubtitleUtils:
                 score += 25
 
             # Quality indicators (max 50: 5 terms × 10 points)
-            quality_indicator_score = 0
-            quality_indicators = ["hdtv", "720p", "1080p", "webdl", "webrip"]
-            for term in quality_indicators:
-                if term in video_file_clean and term in sub_file_clean:
-                    quality_indicator_score += 10
+            quality_indicator_score = 10 * len(
+                video_info["quality_indicators"] & sub_file_words
+            )
             score += min(quality_indicator_score, 50)
 
             # Perfect match bonus (75 points)
@@ -477,17 +615,40 @@ class SubtitleUtils:
             self.console.print(f"[bold red]Error scoring subtitle: {e}[/]")
             return 0
 
+    def score_subtitles(self, video_file_name, subtitles_list):
+        """Score every subtitle against the video filename, each name is only
+        cleaned once and the similarities are computed in one batch"""
+        video_info = self.prepare_video_name(video_file_name)
+        release_names = [sub["attributes"]["release"] for sub in subtitles_list]
+        release_names_clean = [
+            _clean_file_name(release_name or "") for release_name in release_names
+        ]
+        similarities = self.batch_similarity(video_info["clean"], release_names_clean)
+
+        # Bound once, this runs for every candidate
+        score_subtitle = self.score_subtitle
+        scores = {}
+        for sub, release_name, release_name_clean, similarity in zip(
+            subtitles_list, release_names, release_names_clean, similarities
+        ):
+            scores[sub["id"]] = score_subtitle(
+                release_name,
+                video_file_name,
+                sub["attributes"]["moviehash_match"],
+                similarity,
+                video_info,
+                release_name_clean,
+            )
+        return scores
+
     def sort_subtitle_list(self, subtitles_list, scores=None):
         try:
-            sorted_subs = sorted(
-                subtitles_list,
-                key=lambda x: (
-                    scores.get(x["id"], 0)
-                    if scores
-                    else x["attributes"]["download_count"]
-                ),
-                reverse=True,
-            )
+            # Pick the key once rather than checking scores for every item
+            if scores:
+                sort_key = lambda x: scores.get(x["id"], 0)
+            else:
+                sort_key = lambda x: x["attributes"]["download_count"]
+            sorted_subs = sorted(subtitles_list, key=sort_key, reverse=True)
 
             return sorted_subs
         except (KeyError, TypeError) as e:
@@ -504,12 +665,7 @@ class SubtitleUtils:
 
             scores = None
             if media_name:
-                scores = {}
-                for sub in subtitles_list:
-                    release_name = sub["attributes"]["release"]
-                    hash_match = sub["attributes"]["moviehash_match"]
-                    score = self.score_subtitle(release_name, media_name, hash_match)
-                    scores[sub["id"]] = score
+                scores = self.score_subtitles(media_name, subtitles_list)
 
             sorted_subs = self.sort_subtitle_list(subtitles_list, scores)
             self.display_subtitle_options_opensubtitle(sorted_subs, scores)
@@ -534,16 +690,23 @@ class SubtitleUtils:
 
     def auto_select_subtitle(self, video_file_name, subtitles_result_list):
         try:
+            # A hash match or a release named exactly like the video is the
+            # answer already, no need to score every candidate
+            video_file_name_lower = video_file_name.lower()
+            for subtitle in subtitles_result_list:
+                attrs = subtitle["attributes"]
+                if (
+                    attrs.get("moviehash_match")
+                    or (attrs.get("release") or "").lower() == video_file_name_lower
+                ):
+                    return subtitle
+
             max_score = -1
             best_subtitle = None
-            scores = {}
+            scores = self.score_subtitles(video_file_name, subtitles_result_list)
 
             for subtitle in subtitles_result_list:
-                release_name = subtitle["attributes"]["release"]
-                hash_match = subtitle["attributes"]["moviehash_match"]
-                score = self.score_subtitle(release_name, video_file_name, hash_match)
-                scores[subtitle["id"]] = score
-
+                score = scores[subtitle["id"]]
                 if score > max_score:
                     max_score = score
                     best_subtitle = subtitle
@@ -614,17 +777,14 @@ class SubtitleUtils:
 
     def check_if_media_file(self, media_path):
         try:
-            path = Path(media_path)
-            if not path.exists():
+            # check the extension first, it needs no syscall
+            if os.path.splitext(media_path)[1].lower() not in MEDIA_SUFFIXES:
                 return False
-            # if path is file
-            if path.is_file():
-                # check if file is video file
-                if path.suffix.lower() not in [".mp4", ".mkv", ".avi"]:
-                    return False
-            if path.is_dir():
+            # a single stat tells both if it exists and if it is a file
+            try:
+                return stat.S_ISREG(os.stat(media_path).st_mode)
+            except FileNotFoundError:
                 return False
-            return True
         except Exception as e:
             self.console.print(f"[bold red]Error checking media file: {e}[/]")
             return False